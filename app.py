@@ -5,9 +5,23 @@ A Streamlit application for analyzing Credit Reference Agency report data.
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 import io
+import csv
 import re
-from typing import Tuple, Optional
+import itertools
+from typing import Iterable, List, Tuple, Optional
+
+# Newer Streamlit releases accept a callable for download_button data, which
+# defers building the file until the button is clicked
+try:
+    from streamlit.elements.widgets.button import DownloadButtonDataType
+    DOWNLOAD_ACCEPTS_CALLABLE = 'Callable' in str(DownloadButtonDataType)
+except ImportError:
+    DOWNLOAD_ACCEPTS_CALLABLE = False
 
 # Page configuration
 st.set_page_config(
@@ -41,8 +55,158 @@ DEFAULT_COLUMN_NAMES = [
 
 STATUS_CODES = ['A', 'M', 'P', 'V']
 
+# Free-text columns searched by the sidebar filters, lowercased once per upload
+SEARCH_COLUMNS = ['Account_ID', 'Postcode_1', 'Postcode_2']
+
+# Highly repetitive columns stored as categoricals so searches scan the
+# distinct values only
+CATEGORICAL_COLUMNS = ['First_Name', 'Last_Name', 'City', 'County']
+
+# Number of leading lines sampled to detect the column count
+SAMPLE_LINES = 20
+
+# Upper bound on columns when widening the parser for unexpectedly wide rows
+MAX_COLUMNS = 1024
+
+# Explicit open-ended slice stop; pyarrow < 13 fails when stop is omitted
+MAX_SLICE_STOP = 2**31 - 1
+
+# Whitespace the C tokenizer doesn't split on (anything besides tabs, spaces
+# and newlines, e.g. NBSP, \v, \f or a lone \r). Fields are separated by any
+# whitespace str.split() recognises, so these are mapped to spaces first.
+EXTRA_WHITESPACE = re.compile(r'[^\S\t\n ]')
+EXTRA_ASCII_WHITESPACE = '\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
+# The same whitespace as str.split() as an RE2 class, for Arrow columns
+ARROW_WHITESPACE = r'[\s\x0b\x1c-\x1f\x{85}\p{Z}]'
+
 # Helper Functions
 
+def get_column_names(num_columns: int) -> list:
+    """
+    Build column names for a file with the given number of columns.
+    
+    Args:
+        num_columns: Number of columns in the file
+        
+    Returns:
+        List of column names, extending the defaults with generic names if needed
+    """
+    if num_columns <= len(DEFAULT_COLUMN_NAMES):
+        return DEFAULT_COLUMN_NAMES[:num_columns]
+    
+    # Generate more column names if needed
+    column_names = DEFAULT_COLUMN_NAMES.copy()
+    for i in range(len(DEFAULT_COLUMN_NAMES), num_columns):
+        column_names.append(f"Column_{i+1}")
+    return column_names
+
+
+def detect_column_count(sample_lines: Iterable[str]) -> int:
+    """
+    Detect the number of columns from a sample of lines.
+    
+    Args:
+        sample_lines: Leading lines of the file
+        
+    Returns:
+        Widest row in the sample (at least 1)
+    """
+    # split() with no argument splits on the same whitespace as the parser
+    return max((len(line.split()) for line in sample_lines), default=0) or 1
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Replace whitespace the C tokenizer doesn't split on with spaces.
+    
+    Args:
+        text: Decoded chunk of the file
+        
+    Returns:
+        Text whose only whitespace is tabs, spaces and newlines
+    """
+    # Plain ASCII chunks without control whitespace skip the regex
+    if text.isascii() and not any(char in text for char in EXTRA_ASCII_WHITESPACE):
+        return text
+    return EXTRA_WHITESPACE.sub(' ', text)
+
+
+class WhitespaceNormalizingReader(io.TextIOBase):
+    """Read-only text stream that normalizes whitespace as it is read."""
+    
+    def __init__(self, stream: io.TextIOBase):
+        self._stream = stream
+    
+    def readable(self) -> bool:
+        return True
+    
+    def read(self, size: int = -1) -> str:
+        return normalize_whitespace(self._stream.read(size))
+
+
+def is_tab_delimited(sample_lines: List[str]) -> bool:
+    """
+    Check whether sampled lines are strictly tab-delimited.
+    
+    Fields must be separated by single tabs with no other whitespace
+    anywhere, so splitting on tabs gives the same fields as splitting on
+    whitespace.
+    
+    Args:
+        sample_lines: Leading lines of the file
+        
+    Returns:
+        True if every non-blank sampled line is strictly tab-delimited
+    """
+    lines = [line.rstrip('\r\n') for line in sample_lines if line.strip()]
+    return bool(lines) and all('\t' in line and line.split('\t') == line.split() for line in lines)
+
+
+def read_tab_delimited(uploaded_file, num_columns: int) -> Optional[pd.DataFrame]:
+    """
+    Parse a tab-delimited file with Arrow's multithreaded CSV reader.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+        num_columns: Number of columns detected from the sample
+        
+    Returns:
+        DataFrame of Arrow-backed strings, or None if the file has ragged rows,
+        invalid UTF-8, whitespace inside fields or empty fields and needs the
+        whitespace parser instead
+    """
+    # Arrow ends a row at a lone \r, which the whitespace parser treats as a
+    # delimiter
+    content = uploaded_file.getvalue()
+    if b'\r' in content and content.count(b'\r') != content.count(b'\r\n'):
+        return None
+    
+    column_names = get_column_names(num_columns)
+    uploaded_file.seek(0)
+    try:
+        table = pacsv.read_csv(
+            uploaded_file,
+            read_options=pacsv.ReadOptions(column_names=column_names, block_size=16 << 20),
+            parse_options=pacsv.ParseOptions(delimiter='\t', quote_char=False),
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in column_names}
+            )
+        )
+    except pa.ArrowInvalid:
+        return None
+    
+    # The sample only covers the first lines. Whitespace anywhere later would
+    # be split by the whitespace parser, and an empty field (from a doubled,
+    # leading or trailing tab) would be collapsed by it, so hand the file over
+    # to it instead. Short rows already raise above, so '' is always a field.
+    for column in table.columns:
+        if (pc.any(pc.match_substring_regex(column, ARROW_WHITESPACE)).as_py()
+                or pc.any(pc.equal(column, '')).as_py()):
+            return None
+    return table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+
+
 @st.cache_data
 def parse_data_file(_uploaded_file) -> Tuple[pd.DataFrame, bool]:
     """
@@ -55,45 +219,58 @@ def parse_data_file(_uploaded_file) -> Tuple[pd.DataFrame, bool]:
         Tuple of (DataFrame, success_flag)
     """
     try:
-        # Read file content
-        content = _uploaded_file.read()
-        text_content = content.decode('utf-8', errors='ignore')
-        
-        # Split into lines
-        lines = text_content.strip().split('\n')
-        
-        if not lines:
-            return pd.DataFrame(), False
-        
-        # Parse each line - handle tab or multiple spaces as delimiters
-        data_rows = []
-        max_columns = 0
-        
-        for line in lines:
-            # Replace tabs with spaces first, then split on multiple spaces
-            line = line.replace('\t', ' ')
-            # Split on one or more spaces
-            parts = [p.strip() for p in re.split(r'\s+', line.strip()) if p.strip()]
-            data_rows.append(parts)
-            max_columns = max(max_columns, len(parts))
-        
-        # Pad rows to have equal columns
-        for row in data_rows:
-            while len(row) < max_columns:
-                row.append('')
-        
-        # Create DataFrame
-        df = pd.DataFrame(data_rows)
-        
-        # Assign column names
-        if len(df.columns) <= len(DEFAULT_COLUMN_NAMES):
-            df.columns = DEFAULT_COLUMN_NAMES[:len(df.columns)]
-        else:
-            # Generate more column names if needed
-            column_names = DEFAULT_COLUMN_NAMES.copy()
-            for i in range(len(DEFAULT_COLUMN_NAMES), len(df.columns)):
-                column_names.append(f"Column_{i+1}")
-            df.columns = column_names
+        # Decode the upload as a stream instead of copying it into bytes and str
+        _uploaded_file.seek(0)
+        # Only \n ends a line; a lone \r is whitespace like any other
+        stream = io.TextIOWrapper(_uploaded_file, encoding='utf-8', errors='ignore', newline='\n')
+        
+        try:
+            sample_lines = list(itertools.islice(stream, SAMPLE_LINES))
+            num_columns = detect_column_count(sample_lines)
+            
+            # Strictly tab-delimited files can use Arrow's multithreaded reader
+            df = None
+            if is_tab_delimited(sample_lines):
+                df = read_tab_delimited(_uploaded_file, num_columns)
+            
+            # Otherwise tokenize with pandas' C parser; runs of whitespace are
+            # one delimiter. Rows wider than the named columns raise, so widen
+            # and re-read.
+            while df is None:
+                stream.seek(0)
+                try:
+                    df = pd.read_csv(
+                        WhitespaceNormalizingReader(stream),
+                        sep=r'\s+',
+                        engine='c',
+                        header=None,
+                        names=get_column_names(num_columns),
+                        index_col=False,
+                        dtype='string[pyarrow]',
+                        quoting=csv.QUOTE_NONE,
+                        na_filter=False,
+                        skip_blank_lines=True
+                    )
+                except pd.errors.ParserError:
+                    if num_columns >= MAX_COLUMNS:
+                        raise
+                    num_columns *= 2
+        finally:
+            # Release the upload without closing it
+            stream.detach()
+        
+        # Drop trailing columns that no row reaches in a single slice; with
+        # na_filter off, short rows are already padded with empty strings
+        num_columns = len(df.columns)
+        while num_columns > 1 and (df.iloc[:, num_columns - 1] == '').all():
+            num_columns -= 1
+        if num_columns < len(df.columns):
+            df = df.drop(columns=df.columns[num_columns:])
+        
+        # Dictionary-encode highly repetitive columns
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
         
         return df, True
         
@@ -115,86 +292,341 @@ def extract_status_code(df: pd.DataFrame) -> pd.DataFrame:
     if 'Status_Title' not in df.columns:
         return df
     
-    # Extract first character as Status Code
-    df['Status_Code'] = df['Status_Title'].astype(str).str[0]
+    # Split the Arrow string buffer with native kernels: first character is the
+    # Status Code, remaining characters are the Title
+    status_title = pa.array(df['Status_Title'].astype('string[pyarrow]'))
+    status_code = pc.utf8_slice_codeunits(status_title, 0, 1)
+    title = pc.utf8_slice_codeunits(status_title, 1, stop=MAX_SLICE_STOP)
     
-    # Extract remaining characters as Title
-    df['Title'] = df['Status_Title'].astype(str).str[1:]
+    # An empty Status_Title has no Status Code
+    status_code = pc.if_else(pc.equal(status_code, ''), pa.scalar(None, status_code.type), status_code)
     
-    # Reorder columns to put Status_Code and Title after Status_Title
-    cols = df.columns.tolist()
-    status_title_idx = cols.index('Status_Title')
+    # Insert Status_Code and Title right after Status_Title, rebinding the
+    # columns in place instead of reselecting the whole frame. Status_Code is
+    # categorical so isin() compares small integer codes.
+    status_title_idx = df.columns.get_loc('Status_Title')
+    df.insert(status_title_idx + 1, 'Status_Code', pd.arrays.ArrowStringArray(status_code).astype('category'))
+    df.insert(status_title_idx + 2, 'Title', pd.arrays.ArrowStringArray(title))
     
-    # Remove Status_Code and Title from their current positions
-    cols.remove('Status_Code')
-    cols.remove('Title')
+    return df
+
+
+@st.cache_resource(max_entries=4)
+def build_lowercase_columns(_df: pd.DataFrame, file_id: str) -> dict:
+    """
+    Lowercase the searchable columns once per upload.
     
-    # Insert them right after Status_Title
-    cols.insert(status_title_idx + 1, 'Status_Code')
-    cols.insert(status_title_idx + 2, 'Title')
+    The lowercased Arrow arrays are searched case-sensitively, so no case
+    folding happens while filtering.
     
-    df = df[cols]
+    Args:
+        _df: DataFrame with status codes extracted (prefixed with _ to avoid hashing)
+        file_id: ID of the uploaded file, used as the cache key
+        
+    Returns:
+        Dictionary mapping column name to its lowercased Arrow array
+    """
+    return {col: pc.utf8_lower(pa.array(_df[col])) for col in SEARCH_COLUMNS if col in _df.columns}
+
+
+@st.cache_resource(max_entries=4)
+def build_account_index(_df: pd.DataFrame, file_id: str) -> Tuple[pd.Index, np.ndarray, np.ndarray]:
+    """
+    Build a hash index over the Account IDs.
     
-    return df
+    Only called on the first exact-match lookup for an upload, so uploads
+    that never use exact matching don't pay for it. Row positions are grouped
+    per distinct ID rather than stored as one array per key.
+    
+    Args:
+        _df: Input DataFrame (prefixed with _ to avoid hashing)
+        file_id: ID of the uploaded file, used as the cache key
+        
+    Returns:
+        Tuple of (index of distinct IDs, row positions sorted by ID,
+        offsets of each ID's group in those positions)
+    """
+    # An object-dtype Index hashes plain Python strings, which is far faster
+    # to probe than an Index over Arrow-backed strings on pandas 2.x
+    codes, uniques = pd.factorize(_df['Account_ID'].to_numpy(dtype=object))
+    rows = np.argsort(codes, kind='stable')
+    offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(uniques)), out=offsets[1:])
+    ids = pd.Index(uniques, dtype=object)
+    
+    # Build the hashtable now so it is cached with the index, not on the first probe
+    ids.get_indexer(ids[:1])
+    return ids, rows, offsets
 
 
-def filter_dataframe(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
+def lookup_account_rows(account_index: Tuple[pd.Index, np.ndarray, np.ndarray], account_id: str) -> np.ndarray:
     """
-    Apply filters to the DataFrame.
+    Find the rows with an exact Account ID.
+    
+    Args:
+        account_index: Account ID index from build_account_index
+        account_id: Account ID to look up
+        
+    Returns:
+        Row positions in ascending order (empty if the ID is unknown)
+    """
+    ids, rows, offsets = account_index
+    code = ids.get_indexer([account_id])[0]
+    if code < 0:
+        return np.empty(0, dtype=rows.dtype)
+    return rows[offsets[code]:offsets[code + 1]]
+
+
+def contains_mask(values, needle: str, ignore_case: bool = False) -> np.ndarray:
+    """
+    Find literal substring matches with Arrow's native kernel.
+    
+    Categorical Series are matched on their categories and the result is
+    gathered through the codes, so each distinct value is scanned once.
+    
+    Args:
+        values: Series or Arrow array to search
+        needle: Text to search for
+        ignore_case: Match case-insensitively
+        
+    Returns:
+        Boolean array, False where the value is missing
+    """
+    if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+        category_matches = contains_mask(values.cat.categories, needle, ignore_case)
+        # Missing values have code -1, which picks the trailing False
+        return np.append(category_matches, False)[values.cat.codes.to_numpy()]
+    
+    if not isinstance(values, (pa.Array, pa.ChunkedArray)):
+        values = pa.array(values)
+    matches = pc.match_substring(values, needle, ignore_case=ignore_case)
+    return np.asarray(pc.fill_null(matches, False), dtype=bool)
+
+
+def column_contains(df: pd.DataFrame, lowercase_columns: dict, col: str, text: str) -> np.ndarray:
+    """
+    Case-insensitively search a column, using its lowercased copy if cached.
     
     Args:
         df: Input DataFrame
-        filters: Dictionary of filter criteria
+        lowercase_columns: Lowercased search columns from build_lowercase_columns
+        col: Column to search
+        text: Text to search for
         
     Returns:
-        Filtered DataFrame
+        Boolean array of matching rows
+    """
+    if col in lowercase_columns:
+        return contains_mask(lowercase_columns[col], text.lower())
+    return contains_mask(df[col], text, ignore_case=True)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def filter_dataframe(
+    _df: pd.DataFrame,
+    _lowercase_columns: dict,
+    file_id: str,
+    filters: tuple
+) -> np.ndarray:
     """
-    filtered_df = df.copy()
+    Apply filters to the DataFrame.
+    
+    Results are cached on the upload and the filter values, so reruns that
+    only change pagination don't rescan the data. The cache hands back the
+    same read-only position array on every rerun rather than a copy.
     
-    # Account ID filter
-    if filters.get('account_id'):
+    Args:
+        _df: Input DataFrame (prefixed with _ to avoid hashing)
+        _lowercase_columns: Lowercased search columns from build_lowercase_columns
+        file_id: ID of the uploaded file, used as the cache key
+        filters: Sorted tuple of (name, value) filter criteria
+        
+    Returns:
+        Positions of the matching rows in the DataFrame
+    """
+    df = _df
+    lowercase_columns = _lowercase_columns
+    filters = dict(filters)
+    
+    # Exact Account ID lookups narrow the search to the indexed rows up front
+    candidate_rows = None
+    if filters.get('account_id') and filters.get('exact_match'):
         account_search = str(filters['account_id']).strip()
-        if filters.get('exact_match'):
-            filtered_df = filtered_df[filtered_df['Account_ID'] == account_search]
-        else:
-            filtered_df = filtered_df[filtered_df['Account_ID'].astype(str).str.contains(account_search, case=False, na=False)]
+        candidate_rows = lookup_account_rows(build_account_index(df, file_id), account_search)
+        df = df.iloc[candidate_rows]
+        lowercase_columns = {col: values.take(candidate_rows) for col, values in lowercase_columns.items()}
+    
+    # Intersect every other predicate into one mask
+    mask = np.ones(len(df), dtype=bool)
+    
+    # Account ID filter (partial match)
+    if filters.get('account_id') and not filters.get('exact_match'):
+        account_search = str(filters['account_id']).strip()
+        mask &= column_contains(df, lowercase_columns, 'Account_ID', account_search)
     
     # Status code filter
     if filters.get('status_codes'):
-        filtered_df = filtered_df[filtered_df['Status_Code'].isin(filters['status_codes'])]
+        mask &= df['Status_Code'].isin(filters['status_codes']).to_numpy(dtype=bool)
     
     # Text search filters for other columns
     if filters.get('first_name'):
-        filtered_df = filtered_df[filtered_df['First_Name'].astype(str).str.contains(filters['first_name'], case=False, na=False)]
+        mask &= column_contains(df, lowercase_columns, 'First_Name', filters['first_name'])
     
     if filters.get('last_name'):
-        filtered_df = filtered_df[filtered_df['Last_Name'].astype(str).str.contains(filters['last_name'], case=False, na=False)]
+        mask &= column_contains(df, lowercase_columns, 'Last_Name', filters['last_name'])
     
     if filters.get('postcode'):
         # Search in both postcode columns
-        postcode_mask = (
-            filtered_df['Postcode_1'].astype(str).str.contains(filters['postcode'], case=False, na=False) |
-            filtered_df['Postcode_2'].astype(str).str.contains(filters['postcode'], case=False, na=False)
+        mask &= (
+            column_contains(df, lowercase_columns, 'Postcode_1', filters['postcode']) |
+            column_contains(df, lowercase_columns, 'Postcode_2', filters['postcode'])
         )
-        filtered_df = filtered_df[postcode_mask]
     
     # Generic column search
     if filters.get('search_column') and filters.get('search_value'):
         col = filters['search_column']
         val = filters['search_value']
-        if col in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df[col].astype(str).str.contains(val, case=False, na=False)]
+        if col in df.columns:
+            mask &= column_contains(df, lowercase_columns, col, val)
     
-    return filtered_df
+    matches = np.flatnonzero(mask)
+    if candidate_rows is not None:
+        matches = candidate_rows[matches]
+    
+    # The cached array is shared across reruns, so guard it against writes
+    matches.flags.writeable = False
+    return matches
 
 
-def convert_df_to_csv(df: pd.DataFrame) -> bytes:
-    """Convert DataFrame to CSV bytes for download."""
-    return df.to_csv(index=False).encode('utf-8')
+@st.cache_resource(show_spinner=False, max_entries=1)
+def convert_df_to_csv(_df: pd.DataFrame, _row_idx: np.ndarray, file_id: str, filters: tuple) -> bytes:
+    """
+    Convert the selected rows to CSV bytes for download.
+    
+    Encoding uses Arrow's native CSV writer and is cached on the upload and
+    the filter values that produced the rows, so reruns that keep the same
+    filters don't re-encode. The bytes are held as a shared resource so a
+    rerun hands back the same object instead of unpickling a fresh copy.
+    
+    Args:
+        _df: Full DataFrame (prefixed with _ to avoid hashing)
+        _row_idx: Positions of the rows to export (prefixed with _ to avoid hashing)
+        file_id: ID of the uploaded file, used as the cache key
+        filters: Sorted tuple of (name, value) filter criteria, used as the cache key
+        
+    Returns:
+        UTF-8 encoded CSV
+    """
+    buffer = io.BytesIO()
+    pacsv.write_csv(pa.Table.from_pandas(_df.iloc[_row_idx], preserve_index=False), buffer)
+    return buffer.getvalue()
 
 
 # Main Application
 
+@st.fragment
+def results_panel(
+    df: pd.DataFrame,
+    lowercase_columns: dict,
+    file_id: str,
+    filters: dict
+):
+    """
+    Filter the data and render the results, export and pagination.
+    
+    Runs as a fragment so changing the page or page size reruns only this
+    panel rather than the whole script.
+    
+    Args:
+        df: DataFrame with status codes extracted
+        lowercase_columns: Lowercased search columns from build_lowercase_columns
+        file_id: ID of the uploaded file
+        filters: Dictionary of filter criteria
+    """
+    # Apply filters
+    filters_key = tuple(sorted(filters.items()))
+    filtered_idx = filter_dataframe(df, lowercase_columns, file_id, filters_key)
+    
+    # Display results
+    st.header("📋 Results")
+    
+    # Statistics
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Records", f"{len(df):,}")
+    with col2:
+        st.metric("Filtered Records", f"{len(filtered_idx):,}")
+    with col3:
+        if len(df) > 0:
+            filter_pct = (len(filtered_idx) / len(df)) * 100
+            st.metric("Showing", f"{filter_pct:.1f}%")
+    
+    # Export button; the CSV is only built once the user asks for it
+    if len(filtered_idx) > 0:
+        download_args = dict(
+            label="📥 Download Filtered Results (CSV)",
+            file_name=f"cra_report_filtered_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+        export_key = (file_id, filters_key)
+        
+        if DOWNLOAD_ACCEPTS_CALLABLE:
+            st.download_button(
+                data=lambda: convert_df_to_csv(df, filtered_idx, file_id, filters_key),
+                **download_args
+            )
+        elif st.session_state.get('csv_export_key') == export_key:
+            st.download_button(
+                data=convert_df_to_csv(df, filtered_idx, file_id, filters_key),
+                **download_args
+            )
+        else:
+            st.button(
+                "📄 Prepare CSV Export",
+                on_click=lambda: st.session_state.update(csv_export_key=export_key),
+                use_container_width=True
+            )
+    
+    st.divider()
+    
+    # Pagination settings
+    st.subheader("Data Preview")
+    rows_per_page = st.selectbox(
+        "Rows per page:",
+        options=[50, 100, 250, 500, 1000],
+        index=1
+    )
+    
+    # Calculate pagination
+    total_rows = len(filtered_idx)
+    total_pages = (total_rows - 1) // rows_per_page + 1 if total_rows > 0 else 0
+    
+    if total_pages > 0:
+        page = st.number_input(
+            f"Page (1-{total_pages})",
+            min_value=1,
+            max_value=total_pages,
+            value=1,
+            step=1
+        )
+        
+        # Calculate slice
+        start_idx = (page - 1) * rows_per_page
+        end_idx = min(start_idx + rows_per_page, total_rows)
+        
+        # Display paginated data, materializing only the rows on this page
+        st.dataframe(
+            df.iloc[filtered_idx[start_idx:end_idx]],
+            use_container_width=True,
+            height=600
+        )
+        
+        st.caption(f"Showing rows {start_idx + 1} to {end_idx} of {total_rows:,}")
+    else:
+        st.info("No records match the current filters.")
+
+
 def main():
     """Main application function."""
     
@@ -235,6 +667,7 @@ def main():
         
         # Extract status codes
         df = extract_status_code(df)
+        lowercase_columns = build_lowercase_columns(df, uploaded_file.file_id)
         
         # Display total record count
         st.success(f"✅ Successfully loaded {len(df):,} records")
@@ -329,71 +762,8 @@ def main():
             filters = {}
             st.rerun()
         
-        # Apply filters
-        filtered_df = filter_dataframe(df, filters)
-        
-        # Display results
-        st.header("📋 Results")
-        
-        # Statistics
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total Records", f"{len(df):,}")
-        with col2:
-            st.metric("Filtered Records", f"{len(filtered_df):,}")
-        with col3:
-            if len(df) > 0:
-                filter_pct = (len(filtered_df) / len(df)) * 100
-                st.metric("Showing", f"{filter_pct:.1f}%")
-        
-        # Export button
-        if len(filtered_df) > 0:
-            csv_data = convert_df_to_csv(filtered_df)
-            st.download_button(
-                label="📥 Download Filtered Results (CSV)",
-                data=csv_data,
-                file_name=f"cra_report_filtered_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
-        
-        st.divider()
-        
-        # Pagination settings
-        st.subheader("Data Preview")
-        rows_per_page = st.selectbox(
-            "Rows per page:",
-            options=[50, 100, 250, 500, 1000],
-            index=1
-        )
-        
-        # Calculate pagination
-        total_rows = len(filtered_df)
-        total_pages = (total_rows - 1) // rows_per_page + 1 if total_rows > 0 else 0
-        
-        if total_pages > 0:
-            page = st.number_input(
-                f"Page (1-{total_pages})",
-                min_value=1,
-                max_value=total_pages,
-                value=1,
-                step=1
-            )
-            
-            # Calculate slice
-            start_idx = (page - 1) * rows_per_page
-            end_idx = min(start_idx + rows_per_page, total_rows)
-            
-            # Display paginated data
-            st.dataframe(
-                filtered_df.iloc[start_idx:end_idx],
-                use_container_width=True,
-                height=600
-            )
-            
-            st.caption(f"Showing rows {start_idx + 1} to {end_idx} of {total_rows:,}")
-        else:
-            st.info("No records match the current filters.")
+        # Apply filters and display results
+        results_panel(df, lowercase_columns, uploaded_file.file_id, filters)
     
     else:
         # Show instructions when no file is uploaded
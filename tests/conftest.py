@@ -0,0 +1,36 @@
+import io
+import os
+import sys
+
+import pytest
+import streamlit as st
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeUpload(io.BytesIO):
+    """Minimal stand-in for Streamlit's UploadedFile."""
+    
+    name = "report.txt"
+    file_id = "test-file"
+    
+    @property
+    def size(self):
+        return len(self.getvalue())
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Parsing is cached without hashing the upload, so reset between tests."""
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield
+
+
+@pytest.fixture
+def upload():
+    """Build an upload from text lines."""
+    def _upload(lines, sep="  "):
+        text = "\n".join(sep.join(row) if isinstance(row, (list, tuple)) else row for row in lines)
+        return FakeUpload((text + "\n").encode("utf-8"))
+    return _upload
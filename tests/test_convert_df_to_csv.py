@@ -0,0 +1,21 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+import app
+
+
+def test_same_length_selections_with_different_filters_export_their_own_rows():
+    df = pd.DataFrame({'Account_ID': pd.array([str(i) for i in range(600_000)], dtype='string[pyarrow]')})
+    # Large arrays of equal length that Streamlit's sampled hashing can't tell apart
+    first = np.delete(np.arange(len(df)), 5)
+    second = np.delete(np.arange(len(df)), 7)
+    
+    first_csv = app.convert_df_to_csv(df, first, "test-file", (('account_id', 'a'),))
+    second_csv = app.convert_df_to_csv(df, second, "test-file", (('account_id', 'b'),))
+    
+    first_ids = pd.read_csv(io.BytesIO(first_csv), dtype=str)['Account_ID']
+    second_ids = pd.read_csv(io.BytesIO(second_csv), dtype=str)['Account_ID']
+    assert '5' not in set(first_ids) and '7' in set(first_ids)
+    assert '7' not in set(second_ids) and '5' in set(second_ids)
@@ -0,0 +1,36 @@
+import pandas as pd
+
+import app
+
+
+def make_df(status_titles):
+    return pd.DataFrame({
+        'Account_ID': pd.array([str(i) for i in range(len(status_titles))], dtype='string[pyarrow]'),
+        'Status_Title': pd.array(status_titles, dtype='string[pyarrow]'),
+        'First_Name': pd.array(['x'] * len(status_titles), dtype='string[pyarrow]'),
+    })
+
+
+def test_status_code_and_title_are_split_after_status_title():
+    df = app.extract_status_code(make_df(['AMiss', 'VMr', 'PMrs']))
+    
+    assert list(df.columns) == ['Account_ID', 'Status_Title', 'Status_Code', 'Title', 'First_Name']
+    assert df['Status_Code'].tolist() == ['A', 'V', 'P']
+    assert df['Title'].tolist() == ['Miss', 'Mr', 'Mrs']
+    assert isinstance(df['Status_Code'].dtype, pd.CategoricalDtype)
+
+
+def test_empty_status_title_has_no_status_code():
+    df = app.extract_status_code(make_df(['', 'A']))
+    
+    assert pd.isna(df.loc[0, 'Status_Code'])
+    assert df.loc[0, 'Title'] == ''
+    assert df.loc[1, 'Status_Code'] == 'A'
+    assert df.loc[1, 'Title'] == ''
+
+
+def test_multibyte_first_character_is_split_on_characters():
+    df = app.extract_status_code(make_df(['ÉMiss', '漢字x']))
+    
+    assert df['Status_Code'].tolist() == ['É', '漢']
+    assert df['Title'].tolist() == ['Miss', '字x']
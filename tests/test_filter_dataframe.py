@@ -0,0 +1,122 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import app
+
+
+ROWS = [
+    ["100", "x", "0", "0", "0", "0", "AMiss", "Sarah", "Lawrence"],
+    ["101", "x", "0", "0", "0", "0", "MMr", "John", "Giles"],
+    ["100", "x", "0", "0", "0", "0", "PMiss", "Sarah", "Giles"],
+    ["1000", "x", "0", "0", "0", "0", "VMrs", "Ann", "Lawrence"],
+]
+
+
+CITY_ROWS = [
+    ["100", "x", "0", "0", "0", "0", "AMiss", "Sarah", "Lawrence", "70", "VICTORIA", "Southend", "Essex"],
+    ["101", "x", "0", "0", "0", "0", "MMr", "John", "Giles", "12", "HIGH", "Chelmsford", "Essex"],
+    ["102", "x", "0", "0", "0", "0", "PMiss", "Ann", "Giles", "4", "MILL", "Southend", "Essex"],
+]
+
+
+def load(upload):
+    df, _ = app.parse_data_file(upload(ROWS))
+    df = app.extract_status_code(df)
+    return df, app.build_lowercase_columns(df, "test-file")
+
+
+def run_filter(df, lowercase_columns, **filters):
+    return app.filter_dataframe(df, lowercase_columns, "test-file", tuple(sorted(filters.items()))).tolist()
+
+
+def test_exact_account_match_returns_every_duplicate(upload):
+    df, lowercase_columns = load(upload)
+    
+    assert run_filter(df, lowercase_columns, account_id="100", exact_match=True) == [0, 2]
+    assert run_filter(df, lowercase_columns, account_id=" 1000 ", exact_match=True) == [3]
+
+
+def test_exact_account_match_combines_with_other_filters(upload):
+    df, lowercase_columns = load(upload)
+    
+    assert run_filter(df, lowercase_columns, account_id="100", exact_match=True, last_name="gil") == [2]
+    assert run_filter(df, lowercase_columns, account_id="100", exact_match=True, status_codes=("M",)) == []
+
+
+def test_exact_account_match_with_unknown_id(upload):
+    df, lowercase_columns = load(upload)
+    
+    assert run_filter(df, lowercase_columns, account_id="999", exact_match=True) == []
+
+
+def test_partial_account_match(upload):
+    df, lowercase_columns = load(upload)
+    
+    assert run_filter(df, lowercase_columns, account_id="100", exact_match=False) == [0, 2, 3]
+
+
+def test_duplicate_account_lookup_is_faster_than_a_scan():
+    rng = np.random.default_rng(0)
+    ids = np.array([str(100000 + i // 3) for i in range(300_000)], dtype=object)
+    rng.shuffle(ids)
+    df = pd.DataFrame({'Account_ID': pd.array(ids, dtype='string[pyarrow]')})
+    account_index = app.build_account_index(df, "timing-file")
+    keys = [str(100000 + k) for k in rng.integers(0, 100_000, 20)]
+    
+    start = time.perf_counter()
+    results = [app.lookup_account_rows(account_index, key) for key in keys]
+    lookup_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    expected = [np.flatnonzero((df['Account_ID'] == key).to_numpy(dtype=bool)) for key in keys]
+    scan_time = time.perf_counter() - start
+    
+    for rows, expected_rows in zip(results, expected):
+        assert rows.tolist() == expected_rows.tolist()
+        assert len(rows) == 3
+    assert lookup_time < scan_time
+
+
+def test_first_name_search_matches_categories_case_insensitively(upload):
+    df, lowercase_columns = load(upload)
+    
+    assert isinstance(df['First_Name'].dtype, pd.CategoricalDtype)
+    assert run_filter(df, lowercase_columns, first_name="SAR") == [0, 2]
+    assert run_filter(df, lowercase_columns, first_name="an") == [3]
+
+
+def test_city_search_matches_categories(upload):
+    df, _ = app.parse_data_file(upload(CITY_ROWS))
+    df = app.extract_status_code(df)
+    lowercase_columns = app.build_lowercase_columns(df, "test-file")
+    
+    assert isinstance(df['City'].dtype, pd.CategoricalDtype)
+    assert run_filter(df, lowercase_columns, search_column="City", search_value="southEND") == [0, 2]
+    assert run_filter(df, lowercase_columns, search_column="City", search_value="ford", first_name="jo") == [1]
+
+
+def test_status_code_search_skips_missing_codes():
+    df = app.extract_status_code(pd.DataFrame({
+        'Account_ID': pd.array(['1', '2', '3'], dtype='string[pyarrow]'),
+        'Status_Title': pd.array(['AMiss', '', 'MMr'], dtype='string[pyarrow]'),
+    }))
+    lowercase_columns = app.build_lowercase_columns(df, "test-file")
+    
+    assert run_filter(df, lowercase_columns, search_column="Status_Code", search_value="m") == [2]
+    assert run_filter(df, lowercase_columns, search_column="Status_Code", search_value="A") == [0]
+
+
+def test_categorical_search_treats_missing_values_as_no_match():
+    values = pd.Series(['Sarah', None, 'Ann', None], dtype='category')
+    
+    assert app.contains_mask(values, 'A', ignore_case=True).tolist() == [True, False, True, False]
+
+
+def test_arrow_search_accepts_arrays_and_chunked_arrays():
+    values = pa.chunked_array([['sarah', None], ['ann']])
+    
+    assert app.contains_mask(values, 'a').tolist() == [True, False, True]
+    assert app.contains_mask(values.chunk(0), 'a').tolist() == [True, False]
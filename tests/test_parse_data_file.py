@@ -0,0 +1,95 @@
+import app
+
+
+NA_TOKENS = ["NA", "N/A", "null", "None", "nan", "NaN"]
+
+
+def test_na_like_tokens_are_kept_as_text(upload):
+    df, success = app.parse_data_file(upload([
+        ["1", "x", "0", "0", "0", "0", "AMiss", "NA", "null"],
+    ]))
+    
+    assert success
+    assert list(df.columns) == app.DEFAULT_COLUMN_NAMES[:9]
+    assert df.loc[0, "First_Name"] == "NA"
+    assert df.loc[0, "Last_Name"] == "null"
+
+
+def test_na_like_tokens_survive_in_every_column(upload):
+    row = ["1", "x", "0", "0", "0", "0", "AMiss", "Sarah", "Lawrence"] + NA_TOKENS
+    df, success = app.parse_data_file(upload([row, row[:9]]))
+    
+    assert success
+    assert len(df.columns) == len(row)
+    assert df.iloc[0].tolist() == row
+    # Short rows are padded with empty strings, not missing values
+    assert df.iloc[1, 9:].tolist() == [""] * len(NA_TOKENS)
+
+
+def test_na_like_tokens_match_between_parsers(upload):
+    row = ["1", "x", "0", "0", "0", "0", "AMiss", "N/A", "None"]
+    tab_df, _ = app.parse_data_file(upload([row], sep="\t"))
+    app.parse_data_file.clear()
+    space_df, _ = app.parse_data_file(upload([row], sep="  "))
+    
+    assert tab_df.iloc[0].tolist() == row
+    assert space_df.iloc[0].tolist() == row
+
+
+def test_space_after_tab_delimited_sample_is_split_like_whitespace(upload):
+    rows = [["1", "x", "AMiss", "Sarah"]] * (app.SAMPLE_LINES + 5)
+    df, success = app.parse_data_file(upload(["\t".join(row) for row in rows] + ["2\tx\tAMiss\t70 VICTORIA"]))
+    
+    assert success
+    assert len(df.columns) == 5
+    assert df.iloc[-1].tolist() == ["2", "x", "AMiss", "70", "VICTORIA"]
+    assert df.iloc[0].tolist() == ["1", "x", "AMiss", "Sarah", ""]
+
+
+def test_strict_tab_delimited_file_uses_arrow_reader(upload):
+    rows = [["1", "x", "AMiss", "Sarah"], ["2", "y", "VMr", "John"]]
+    
+    assert app.read_tab_delimited(upload(rows, sep="\t"), 4) is not None
+    assert app.read_tab_delimited(upload(["1\tx\tAMiss\t70 VICTORIA"]), 4) is None
+
+
+def test_doubled_tab_after_tab_delimited_sample_collapses_like_whitespace(upload):
+    rows = ["1\tx\tAMiss"] * (app.SAMPLE_LINES + 5)
+    df, success = app.parse_data_file(upload(rows + ["2\t\tVMr"]))
+    
+    assert success
+    assert df.iloc[-1].tolist() == ["2", "VMr", ""]
+
+
+def test_leading_tab_after_tab_delimited_sample_collapses_like_whitespace(upload):
+    rows = ["1\tx\tAMiss"] * (app.SAMPLE_LINES + 5)
+    df, success = app.parse_data_file(upload(rows + ["\t2\tVMr"]))
+    
+    assert success
+    assert df.iloc[-1].tolist() == ["2", "VMr", ""]
+
+
+def test_non_breaking_space_is_a_delimiter(upload):
+    df, success = app.parse_data_file(upload(["1 x\xa0z AMiss"]))
+    
+    assert success
+    assert app.detect_column_count(["1 x\xa0z AMiss"]) == 4
+    assert df.iloc[0].tolist() == ["1", "x", "z", "AMiss"]
+
+
+def test_lone_carriage_return_is_a_delimiter_not_a_line_break(upload):
+    df, success = app.parse_data_file(upload(["1 x\rz AMiss\r", "2\x0by\x0cw VMr\r"]))
+    
+    assert success
+    assert df.iloc[:, :4].values.tolist() == [["1", "x", "z", "AMiss"], ["2", "y", "w", "VMr"]]
+
+
+def test_other_whitespace_after_tab_delimited_sample_is_split_like_whitespace(upload):
+    rows = ["1\tx\tAMiss"] * (app.SAMPLE_LINES + 5)
+    
+    for line in ["2\tx\xa0y\tVMr", "2\tx\ry\tVMr"]:
+        app.parse_data_file.clear()
+        df, success = app.parse_data_file(upload(rows + [line]))
+        
+        assert success
+        assert df.iloc[-1].tolist() == ["2", "x", "y", "VMr"]